@@ -1,5 +1,6 @@
 import numpy as np
-from scipy.stats import gaussian_kde
+from types import SimpleNamespace
+from scipy.signal import fftconvolve
 import matplotlib.colors
 import matplotlib.pyplot as plt
 from matplotlib import style
@@ -27,19 +28,299 @@ def getBounds(data):
         Difference between 50th and 5th percentiles of data
     """
 
-    # Transform to a numpy arry
-    data = np.array(data)
+    # Transform to a numpy array (without copying if data is already an array)
+    data = np.asarray(data)
 
-    # Get median, 5% and 95% quantiles
-    med = np.median(data)
-    upperLim = np.sort(data)[int(0.95*data.size)]
-    lowerLim = np.sort(data)[int(0.05*data.size)]
+    # Get median, 5% and 95% quantiles. A single partial sort places every required
+    # order statistic at its sorted position, avoiding repeated full sorts of the data
+    kLow = int(0.05*data.size)
+    kHigh = int(0.95*data.size)
+    kMed = ((data.size-1)//2, data.size//2)
+    partitioned = np.partition(data, [kLow, *kMed, kHigh, data.size-1])
+
+    # NaNs are partitioned to the end of the array; as with np.median, propagate them
+    if np.isnan(partitioned[-1]):
+        return np.nan, np.nan, np.nan
+
+    med = 0.5*(partitioned[kMed[0]] + partitioned[kMed[1]])
+    upperLim = partitioned[kHigh]
+    lowerLim = partitioned[kLow]
  
     # Turn quantiles into upper and lower uncertainties
     upperError = upperLim - med
     lowerError = med - lowerLim
     
     return med,upperError,lowerError
+
+def _kde_factor(weights, bw_method):
+
+    """
+    Bandwidth factor of a 2D Gaussian KDE, following the conventions of `scipy.stats.gaussian_kde`
+    (in two dimensions, Scott's and Silverman's rules coincide). As in scipy, a callable `bw_method`
+    is passed an object exposing the attributes `d`, `n`, `neff`, and `weights`, and the methods
+    `scotts_factor` and `silverman_factor`
+    """
+
+    neff = weights.sum()**2/np.sum(weights**2)
+    if bw_method is None or bw_method in ('scott', 'silverman'):
+        return neff**(-1./6.)
+    elif np.isscalar(bw_method) and not isinstance(bw_method, str):
+        return bw_method
+    elif callable(bw_method):
+        kde = SimpleNamespace(
+            d=2,
+            n=weights.size,
+            neff=neff,
+            weights=weights/weights.sum(),
+            scotts_factor=lambda: neff**(-1./6.),
+            silverman_factor=lambda: neff**(-1./6.))
+        return bw_method(kde)
+    else:
+        raise ValueError("`bw_method` should be 'scott', 'silverman', a scalar, or a callable")
+
+# Largest grid padding (in cells), and smallest ratio of kernel width to grid spacing, for which
+# contour KDEs are evaluated by FFT convolution. Beyond these, KDEs are instead evaluated directly.
+# Below a ratio of ~0.75, the kernel is too poorly sampled on the grid for FFT convolution to remain
+# accurate to a few percent
+_KDE_MAX_PADDING = 500
+_KDE_MIN_SAMPLING = 0.75
+
+def _kde_padding(sigma, grid):
+
+    """
+    Number of grid cells by which to pad an equispaced grid, so that samples lying up to
+    four kernel widths `sigma` beyond the grid still contribute to the edges. This is also
+    the half-width of the (untruncated) kernel used by `_kde_smooth`
+    """
+
+    return int(np.ceil(4.*sigma/(grid[1]-grid[0])))
+
+def _kde_direct(x, y, xgrid, ygrid, cov, weights):
+
+    """
+    Evaluate a 2D Gaussian KDE with kernel covariance `cov` by summing the kernel of every sample at
+    every grid point. Used instead of `_kde_smooth` when the kernel is too wide or too narrow, relative
+    to the grid spacing, to be represented on the grid. Samples are processed in blocks to bound memory
+    """
+
+    inv_cov = np.linalg.inv(cov)
+    pdf = np.zeros((xgrid.size, ygrid.size))
+    block = max(1, 2**22//(xgrid.size*ygrid.size))
+    for start in range(0, x.size, block):
+        offset_x = xgrid[:, np.newaxis, np.newaxis] - x[np.newaxis, np.newaxis, start:start+block]
+        offset_y = ygrid[np.newaxis, :, np.newaxis] - y[np.newaxis, np.newaxis, start:start+block]
+        kernel = np.exp(-0.5*(inv_cov[0, 0]*offset_x**2 + 2.*inv_cov[0, 1]*offset_x*offset_y + inv_cov[1, 1]*offset_y**2))
+        pdf += kernel @ weights[start:start+block]
+
+    pdf /= weights.sum()*2.*np.pi*np.sqrt(np.linalg.det(cov))
+
+    return pdf.T
+
+def _kde_linear_bins(x, grid, pad):
+
+    """
+    Linear binning of samples onto a padded, equispaced grid. Each sample lying between grid points
+    `index` and `index+1` (counted from the start of the padded grid) is split between the two,
+    with fraction `1-frac` assigned to the former and `frac` to the latter
+    """
+
+    position = (x - grid[0])/(grid[1] - grid[0]) + pad
+    index = np.floor(position).astype(np.intp)
+    frac = position - index
+    return index, frac
+
+def _kde_linear_histogram(xbins, ybins, nx, ny, weights):
+
+    """
+    Weighted 2D histogram on a padded grid of shape `(nx, ny)`, given the linear binning of samples
+    along each dimension (as returned by `_kde_linear_bins`). Each sample is shared among the four
+    surrounding grid points; contributions to points beyond the padded grid are discarded
+    """
+
+    ix, fx = xbins
+    iy, fy = ybins
+    H = np.zeros(nx*ny)
+    for jx, wx in ((ix, 1.-fx), (ix+1, fx)):
+        for jy, wy in ((iy, 1.-fy), (iy+1, fy)):
+            keep = (jx >= 0) & (jx < nx) & (jy >= 0) & (jy < ny)
+            H += np.bincount(jx[keep]*ny + jy[keep], weights=(weights*wx*wy)[keep], minlength=nx*ny)
+    return H.reshape(nx, ny)
+
+def _kde_smooth(H, xgrid, ygrid, px, py, cov, total_weight):
+
+    """
+    Convolve a histogram of samples, binned on a padded grid, with a Gaussian kernel of covariance
+    `cov` and return the resulting normalized density over the unpadded grid
+    """
+
+    # Construct the Gaussian kernel over grid offsets, broadcasting the two offset vectors
+    # against one another rather than allocating full meshgrids, and convolve.
+    # Single precision is ample for drawing contours, and roughly halves the cost of the FFTs
+    inv_cov = np.linalg.inv(cov)
+    offset_x = (xgrid[1] - xgrid[0])*np.arange(-px, px+1)[:, np.newaxis]
+    offset_y = (ygrid[1] - ygrid[0])*np.arange(-py, py+1)[np.newaxis, :]
+    kernel = np.exp(-0.5*(inv_cov[0, 0]*offset_x**2 + 2.*inv_cov[0, 1]*offset_x*offset_y + inv_cov[1, 1]*offset_y**2))
+    pdf = fftconvolve(H.astype(np.float32), kernel.astype(np.float32), mode='same')[px:px+xgrid.size, py:py+ygrid.size]
+
+    # Normalize, removing small negative values arising from FFT roundoff
+    pdf = np.maximum(pdf, 0.)/(total_weight*2.*np.pi*np.sqrt(np.linalg.det(cov)))
+
+    return pdf.T
+
+def _bin_indices(x, bounds, nbins):
+
+    """
+    Index of the equal-width bin, among `nbins` bins spanning `bounds`, into which each sample falls,
+    or -1 for samples lying outside `bounds` (or non-finite). Bins are assigned exactly as in `np.histogram`,
+    with edges given by `np.linspace`, and the last bin including its right edge
+    """
+
+    index = np.full(x.shape, -1, dtype=np.intp)
+    inside = np.isfinite(x) & (x >= bounds[0]) & (x <= bounds[1])
+    x = x[inside]
+
+    # Compute bin indices arithmetically, then correct samples that roundoff places one bin away from
+    # the one delimited by the bin edges themselves (following the same correction made by `np.histogram`)
+    edges = np.linspace(bounds[0], bounds[1], nbins+1)
+    i = np.floor((x - bounds[0])*(nbins/(bounds[1] - bounds[0]))).astype(np.intp)
+    np.clip(i, 0, nbins - 1, out=i)
+    i[x < edges[i]] -= 1
+    i[(x >= edges[i+1]) & (i != nbins - 1)] += 1
+
+    index[inside] = i
+    return index
+
+def _pair_histogram(ix, iy, nx, ny, weights=None):
+
+    """
+    (Optionally weighted) 2D histogram of samples with precomputed bin indices `ix` and `iy`
+    along each dimension, as returned by `_bin_indices`, on a grid of shape `(nx, ny)`.
+    Samples with index -1 along either dimension are excluded
+    """
+
+    keep = (ix >= 0) & (iy >= 0)
+    H = np.bincount(ix[keep]*ny + iy[keep], weights=None if weights is None else weights[keep], minlength=nx*ny)
+    return H.reshape(nx, ny)
+
+def fft_kde_2d(x, y, xgrid, ygrid, bw_method=None, weights=None, data_cov=None):
+
+    """
+    Helper function to evaluate a 2D Gaussian kernel density estimate on a regular grid.
+    Evaluates the same estimate from which corner draws contours on 2D posteriors, for a single pair
+    of data columns (see `_fft_kde_pairs`).
+
+    Rather than summing a kernel over every sample at every grid point, samples are linearly binned
+    onto the (equispaced) grid and the resulting histogram is convolved with a Gaussian kernel
+    via FFT. The cost is therefore independent of the number of samples, beyond the initial binning.
+    If the kernel is too wide or too narrow, relative to the grid spacing, to be represented on the grid,
+    the KDE is instead evaluated directly by summing over samples.
+    The kernel covariance is chosen as in `scipy.stats.gaussian_kde`.
+
+    Parameters
+    ----------
+    x : numpy.array
+        1D array of samples along the first dimension
+    y : numpy.array
+        1D array of samples along the second dimension
+    xgrid : numpy.array
+        Equispaced grid on which to evaluate the KDE along the first dimension
+    ygrid : numpy.array
+        Equispaced grid on which to evaluate the KDE along the second dimension
+    bw_method : None, str, float, or callable (optional)
+        Bandwidth selection method; either `'scott'`, `'silverman'`, a scalar bandwidth factor, or a
+        callable returning the bandwidth factor, as in `scipy.stats.gaussian_kde`.
+        If `None`, Scott's rule is used. Default `None`.
+    weights : None or numpy.array (optional)
+        Weights of samples. If `None`, samples are equally weighted. Default `None`.
+    data_cov : None or numpy.array (optional)
+        Precomputed (weighted) 2x2 covariance matrix of the samples. If `None`, it is computed from
+        `x` and `y`. Allows a caller evaluating many pairs of the same data to compute covariances once.
+        Default `None`.
+
+    Returns
+    -------
+    pdf : numpy.array
+        Array of shape `(ygrid.size, xgrid.size)` containing the KDE evaluated over the grid
+    """
+
+    pdfs = _fft_kde_pairs([x, y], [xgrid, ygrid], data_cov=data_cov, bw_method=bw_method, weights=weights)
+    if (0, 1) not in pdfs:
+        raise np.linalg.LinAlgError("Covariance of samples is singular; KDE cannot be evaluated")
+
+    return pdfs[(0, 1)]
+
+def _fft_kde_pairs(data, grids, data_cov=None, bw_method=None, weights=None):
+
+    """
+    Helper function to evaluate 2D Gaussian kernel density estimates over every pair of data columns
+    at once. Invoked by corner to create contours on all 2D posteriors, and by `fft_kde_2d`.
+
+    The padding of each column's grid depends only on that column's variance, so every sample is
+    linearly binned onto grid points once per column, rather than once per pair. Each pair's histogram
+    is then obtained by `np.bincount` over the combined grid indices.
+
+    Parameters
+    ----------
+    data : list
+        List of 1D sample arrays, one per data column
+    grids : list
+        List of equispaced grids on which to evaluate KDEs, one per data column
+    data_cov : None or numpy.array (optional)
+        Precomputed (weighted) covariance matrix between all data columns. If `None`, it is computed
+        from `data`. Default `None`.
+    bw_method : None, str, float, or callable (optional)
+        Bandwidth selection method, as in `fft_kde_2d`. Default `None`.
+    weights : None or numpy.array (optional)
+        Weights of samples, as in `fft_kde_2d`. Default `None`.
+
+    Returns
+    -------
+    pdfs : dict
+        Dictionary mapping each pair of column indices `(i, j)`, with `i < j`, to the KDE of columns
+        `i` (along the first dimension) and `j` (along the second), evaluated over their grids.
+        Pairs with singular covariance are omitted.
+    """
+
+    if weights is None:
+        weights = np.ones(data[0].size)
+    weights = np.asarray(weights, dtype=np.float64)
+    factor = _kde_factor(weights, bw_method)
+
+    # Kernel covariance
+    if data_cov is None:
+        data_cov = np.cov(np.vstack(data), aweights=weights)
+    cov = np.asarray(data_cov)*factor**2
+
+    # Pad and bin each column once. Columns whose kernel is too wide (requiring excessive padding)
+    # or too narrow (poorly sampled by the grid) to be represented on the grid are not binned,
+    # and pairs involving them are evaluated directly
+    pads = [_kde_padding(np.sqrt(cov[i, i]), grid) for i, grid in enumerate(grids)]
+    use_fft = [np.sqrt(cov[i, i]) >= _KDE_MIN_SAMPLING*(grid[1]-grid[0]) and pad <= _KDE_MAX_PADDING for i, (grid, pad) in enumerate(zip(grids, pads))]
+    linear_bins = [_kde_linear_bins(x, grid, pad) if fft else None for x, grid, pad, fft in zip(data, grids, pads, use_fft)]
+
+    pdfs = {}
+    for i in range(len(data)):
+        for j in range(i+1, len(data)):
+
+            # Skip pairs whose covariance is singular (e.g. a column with constant samples,
+            # or two perfectly correlated columns), for which no Gaussian kernel can be defined
+            pair_cov = cov[np.ix_([i, j], [i, j])]
+            if np.linalg.det(pair_cov) <= 1e-12*pair_cov[0, 0]*pair_cov[1, 1]:
+                continue
+
+            if not (use_fft[i] and use_fft[j]):
+                pdfs[(i, j)] = _kde_direct(data[i], data[j], grids[i], grids[j], pair_cov, weights)
+                continue
+
+            H = _kde_linear_histogram(
+                linear_bins[i],
+                linear_bins[j],
+                grids[i].size + 2*pads[i],
+                grids[j].size + 2*pads[j],
+                weights)
+            pdfs[(i, j)] = _kde_smooth(H, grids[i], grids[j], pads[i], pads[j], pair_cov, weights.sum())
+
+    return pdfs
     
 def corner(
         plot_data,
@@ -58,6 +339,8 @@ def corner(
         hspace=0.1,
         wspace=0.1,
         contour_levels=None,
+        contour_max_samples=10000,
+        contour_grid_size=100,
         contour_kde_args={},
         contour_plot_args={'colors':'black'}):
 
@@ -88,7 +371,7 @@ def corner(
     hist_alpha : float (optional)
         Defines transparency of 1D histograms. Default `0.7`.
     bins : int (optional)
-        Defines number of 1D histogram bins and 2D hexbins to use. Default `20`.
+        Defines number of 1D histogram bins and 2D histogram bins (per dimension) to use. Default `20`.
     labelsize : int (optional)
         Defines fontsize of axis labels. Default `14` 
     ticklabelsize : int (optional)
@@ -98,7 +381,7 @@ def corner(
     show_bounds : bool (optional)
         If True, will quote marginal 95% credible intervals above 1D histograms. Default `True`.
     scatter : bool (optional)
-        If True, will produce 2D scatter plots instead of hexbin plots. Default `False`.
+        If True, will produce 2D scatter plots instead of 2D histograms. Default `False`.
     logscale : bool (optional)
         If True, a logarithmic color scale is adopted for 2D posteriors. Default `False`.
     vmax : None or float (optional)
@@ -112,10 +395,18 @@ def corner(
         Float that adjusts the horizontal spacing of subplots. Default `0.1`.
     contour_levels : None, list, or tuple (optional)
         If not `None`, then defines probabilities at which contour levels will be drawn in 2D subplots.
-        Default `None`.
+        Contours are omitted from subplots in which the samples are degenerate. Default `None`.
+    contour_max_samples : None or int (optional)
+        Maximum number of samples used to construct contour KDEs. If more samples are provided, a random
+        (but reproducible) subset of this size is used; 1D histograms and 2D density plots still use all
+        samples. If `None`, all samples are used. Default `10000`.
+    contour_grid_size : int (optional)
+        Number of points, along each dimension, of the grid over which contour KDEs are evaluated.
+        Must be at least 2. Coarser grids are faster, but less accurate. Default `100`.
     contour_kde_args : None or dict (optional)
-        Keyword arguments provided to `scipy.stats.gaussian_kde` as a step in creating contours.
-        Can be used, e.g. to adjust KDE bandwidth. Default `None`.
+        Keyword arguments controlling the KDEs from which contours are drawn (evaluated by `_fft_kde_pairs`,
+        as in `fft_kde_2d`). Accepts `bw_method` and `weights`, with the same meaning as in
+        `scipy.stats.gaussian_kde`. Can be used, e.g. to adjust KDE bandwidth. Default `None`.
     contour_plot_args : None or dict (optional)
         Keyword arguments provided to `matplotlib.pyplot.contour`. Can be used to adjust contour linestyles,
         etc. Default `{'colors':'black'}`.
@@ -129,106 +420,151 @@ def corner(
     keys = list(plot_data)    
     ndim = len(keys)
 
+    if contour_grid_size < 2:
+        raise ValueError("`contour_grid_size` should be at least 2")
+
     if figsize is None:
         figsize = (2*ndim, 2*ndim)
     fig = plt.figure(figsize=figsize)
+
+    # Create all subplots at once. Panels in a column share an x-axis, and 2D panels in a row share
+    # a y-axis (diagonal 1D histograms keep their own y-axes). Unused upper-triangle axes are removed.
+    # Tick labels are configured with a single call per axis, and shown only along the left column
+    # and bottom row
+    axes = fig.subplots(ndim, ndim, sharex='col', squeeze=False)
+    for row in range(ndim):
+        for col in range(ndim):
+            if col > row:
+                axes[row, col].remove()
+                continue
+            elif 0 < col < row:
+                axes[row, col].sharey(axes[row, 0])
+            axes[row, col].tick_params(
+                which='major',
+                labelsize=ticklabelsize,
+                labelleft=(col == 0),
+                labelbottom=(row == ndim-1))
     
+    # Color normalization of 2D density plots (instantiated per panel, so that each autoscales independently)
     if logscale==True:
-        hexscale='log'
+        norm_class = matplotlib.colors.LogNorm
     else:
-        hexscale=None
+        norm_class = matplotlib.colors.Normalize
 
     # Define a linear color map
     cmap = matplotlib.colors.LinearSegmentedColormap.from_list("", ["white", color])
+
+    # Convert samples to arrays and define 1D histogram bin edges once per data column,
+    # rather than repeatedly within the plotting loop below
+    data_arr = {k: np.ascontiguousarray(v['data'], dtype=np.float64) for k, v in plot_data.items()}
+    edges = {k: np.linspace(v['plot_bounds'][0], v['plot_bounds'][1], bins) for k, v in plot_data.items()}
+
+    # Similarly, assign samples to 2D histogram bins once per data column. Each 2D panel's histogram
+    # is then a single `np.bincount`, avoiding a binary search over bin edges for every pair of columns
+    if not scatter and ndim > 1:
+        bin_indices = {k: _bin_indices(data_arr[k], plot_data[k]['plot_bounds'], bins) for k in keys}
+
+    # If drawing contours, select the samples used to construct KDEs, randomly downsampling
+    # (with a fixed seed, for reproducibility) if more than `contour_max_samples` are provided
+    draw_contours = contour_levels is not None and len(contour_levels) > 0
+    if draw_contours and ndim > 1:
+
+        kde_data = data_arr
+        kde_args = dict(contour_kde_args)
+        nsamples = data_arr[keys[0]].size
+        if contour_max_samples is not None and nsamples > contour_max_samples:
+            rng = np.random.default_rng(seed=0)
+            idx = rng.choice(nsamples, size=contour_max_samples, replace=False)
+            kde_data = {k: v[idx] for k, v in data_arr.items()}
+            if kde_args.get('weights') is not None:
+                kde_args['weights'] = np.asarray(kde_args['weights'])[idx]
+
+        # Compute the covariance between all data columns in a single pass, and evaluate
+        # KDEs for every pair of columns over grids spanning their plot bounds
+        data_cov = np.atleast_2d(np.cov(np.vstack([kde_data[k] for k in keys]), aweights=kde_args.get('weights')))
+        kde_grids = [np.linspace(plot_data[k]['plot_bounds'][0], plot_data[k]['plot_bounds'][1], contour_grid_size) for k in keys]
+        kde_pdfs = _fft_kde_pairs([kde_data[k] for k in keys], kde_grids, data_cov, **kde_args)
     
     # Loop across dimensions that we want to plot
     for i, key in enumerate(keys):
        
         # Plot the marginal 1D posterior (i.e. top of a corner plot column)
-        ax = fig.add_subplot(ndim, ndim, int(1+(ndim+1)*i))
+        ax = axes[i, i]
         
-        ax.hist(plot_data[key]['data'],
-                bins=np.linspace(plot_data[key]['plot_bounds'][0], plot_data[key]['plot_bounds'][1], bins),
+        # Histogram the samples once, then draw both the filled histogram and its outline
+        hist, _ = np.histogram(data_arr[key], bins=edges[key], density=True)
+        ax.stairs(hist,
+                edges[key],
+                fill=True,
                 rasterized=True,
                 color=color,
                 alpha=hist_alpha,
-                density=True,
                 zorder=0)
-        ax.hist(plot_data[key]['data'],
-                bins=np.linspace(plot_data[key]['plot_bounds'][0], plot_data[key]['plot_bounds'][1], bins),
-                histtype='step',
+        ax.stairs(hist,
+                edges[key],
                 color='black',
-                density=True,
                 zorder=2)
         ax.grid(True, dashes=(1, 3))
         ax.set_xlim(plot_data[key]['plot_bounds'][0], plot_data[key]['plot_bounds'][1])
         if show_bounds:
-            ax.set_title(r"${0:.2f}^{{+{1:.2f}}}_{{-{2:.2f}}}$".format(*getBounds(plot_data[key]['data'])), fontsize=titlesize)
-
-        # Turn off tick labels if this isn't the first dimension
-        if i!=0:
-            ax.set_yticklabels([])
-        else:
-            ax.tick_params(axis='y', which='major', labelsize=ticklabelsize)
+            ax.set_title(r"${0:.2f}^{{+{1:.2f}}}_{{-{2:.2f}}}$".format(*getBounds(data_arr[key])), fontsize=titlesize)
 
         # If this is the last dimension add an x-axis label
         if i == ndim-1:
             ax.set_xlabel(plot_data[key]['label'], fontsize=labelsize)
-            ax.tick_params(axis='x', which='major', labelsize=ticklabelsize)
             
         # If not the last dimension, loop across other variables and fill in the rest of the column with 2D plots
         else:
             
-            ax.set_xticklabels([])
             for j, k in enumerate(keys[i+1:]):
                 
                 # Make a 2D density plot
-                ax = fig.add_subplot(ndim, ndim, int(1+(ndim+1)*i + (j+1)*ndim))
+                ax = axes[i+j+1, i]
 
                 if not scatter:
-                    ax.hexbin(
-                        plot_data[key]['data'],
-                        plot_data[k]['data'],
-                        cmap=cmap,
-                        mincnt=1,
-                        gridsize=bins,
-                        bins=hexscale,
-                        rasterized=True,
+
+                    # Bin samples and mask empty bins, then draw the histogram as a single rasterized image
+                    H = _pair_histogram(bin_indices[key], bin_indices[k], bins, bins)
+                    ax.imshow(
+                        np.ma.masked_less(H, 1).T,
                         extent=(
                             plot_data[key]['plot_bounds'][0],
                             plot_data[key]['plot_bounds'][1],
                             plot_data[k]['plot_bounds'][0],
                             plot_data[k]['plot_bounds'][1]),
-                        linewidths=(0,),
-                        zorder=0,
-                        vmax=vmax)
+                        origin='lower',
+                        aspect='auto',
+                        cmap=cmap,
+                        norm=norm_class(vmax=vmax),
+                        interpolation='nearest',
+                        rasterized=True,
+                        zorder=0)
 
                 else:
                     ax.scatter(
-                        plot_data[key]['data'],
-                        plot_data[k]['data'],
+                        data_arr[key],
+                        data_arr[k],
                         color=color,
                         s=10,
                         marker='.')
 
                 # Plot contours if requested
-                if contour_levels is not None:
+                if draw_contours and (i, i+j+1) in kde_pdfs:
 
-                    # Set up KDE and evaluate over grid
-                    kde = gaussian_kde([plot_data[key]['data'], plot_data[k]['data']], **contour_kde_args)
-                    xgrid = np.linspace(plot_data[key]['plot_bounds'][0], plot_data[key]['plot_bounds'][1], 100)
-                    ygrid = np.linspace(plot_data[k]['plot_bounds'][0], plot_data[k]['plot_bounds'][1], 100)
-                    X, Y = np.meshgrid(xgrid, ygrid)
-                    pdf = kde([X.reshape(-1), Y.reshape(-1)])
+                    # Retrieve KDE evaluated over grid
+                    xgrid = kde_grids[i]
+                    ygrid = kde_grids[i+j+1]
+                    pdf = kde_pdfs[(i, i+j+1)]
 
-                    # Interpolate levels onto PDF grid
-                    sorted_pdf = np.sort(pdf)[::-1]
+                    # Interpolate levels onto PDF grid. Sorting in ascending order, the probability
+                    # enclosed above a given PDF value is one minus the cumulative sum up to that value
+                    sorted_pdf = np.sort(pdf, axis=None)
                     cdf = np.cumsum(sorted_pdf)
                     cdf /= cdf[-1]
 
                     # Contour plot
-                    levels = [np.interp(l, cdf, sorted_pdf) for l in contour_levels]
-                    ax.contour(xgrid, ygrid, pdf.reshape(X.shape), levels=np.sort(levels), **contour_plot_args)
+                    levels = np.sort(np.interp(1.-np.asarray(contour_levels), cdf, sorted_pdf))
+                    ax.contour(xgrid, ygrid, pdf, levels=levels, **contour_plot_args)
 
                 
                 # Set plot bounds
@@ -239,16 +575,10 @@ def corner(
                 # If still in the first column, add a y-axis label
                 if i==0:
                     ax.set_ylabel(plot_data[k]['label'], fontsize=labelsize)
-                    ax.tick_params(axis='y', which='major', labelsize=ticklabelsize)
-                else:
-                    ax.set_yticklabels([])
                
                 # If on the last row, add an x-axis label
                 if j==ndim-i-2:
                     ax.set_xlabel(plot_data[key]['label'], fontsize=labelsize)
-                    ax.tick_params(axis='x', which='major', labelsize=ticklabelsize)
-                else:
-                    ax.set_xticklabels([])
                     
     plt.tight_layout()    
     plt.subplots_adjust(hspace=hspace, wspace=wspace)
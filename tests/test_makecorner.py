@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from scipy.stats import gaussian_kde
+
+from makecorner import corner, fft_kde_2d, getBounds
+from makecorner.makecorner import _bin_indices, _pair_histogram
+
+@pytest.mark.parametrize("bounds, bw_method", [
+    ((-5, 5), None),
+    ((-0.2, 0.2), None),
+    ((-0.01, 0.01), None),
+    ((-1, 1), 1.0),
+    ((-3, 3), 0.02),
+    ])
+def test_fft_kde_2d_matches_gaussian_kde(bounds, bw_method):
+
+    # Correlated samples, evaluated over grids ranging from wide to zoomed-in relative to the bandwidth
+    rng = np.random.default_rng(0)
+    x, y = rng.multivariate_normal([0, 0], [[1, 0.8], [0.8, 1]], 10000).T
+    grid = np.linspace(bounds[0], bounds[1], 100)
+
+    pdf = fft_kde_2d(x, y, grid, grid, bw_method=bw_method)
+
+    X, Y = np.meshgrid(grid, grid)
+    expected = gaussian_kde([x, y], bw_method=bw_method)(np.vstack([X.ravel(), Y.ravel()])).reshape(X.shape)
+    assert np.abs(pdf - expected).max() < 0.02*expected.max()
+
+def test_pair_histogram_matches_histogram2d():
+
+    # Samples lying exactly on interior bin edges, on the outer bounds, beyond them, and non-finite
+    rng = np.random.default_rng(0)
+    x = np.r_[np.round(rng.uniform(-1, 1, 10000), 1), -1.5, 1.5, np.nan, np.inf]
+    y = np.r_[np.round(rng.uniform(-1, 1, 10000), 1), 0., 0., 0., 0.]
+
+    H = _pair_histogram(_bin_indices(x, (-1, 1), 20), _bin_indices(y, (-1, 1), 20), 20, 20)
+
+    finite = np.isfinite(x)
+    expected, _, _ = np.histogram2d(x[finite], y[finite], bins=20, range=[(-1, 1), (-1, 1)])
+    assert np.array_equal(H, expected)
+
+def test_getBounds():
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=5001)
+    low, med, high = np.quantile(data, [0.05, 0.5, 0.95], method='lower')
+    assert np.allclose(getBounds(data), (np.median(data), high-med, med-low))
+
+    # NaNs propagate, as with np.median
+    data[100] = np.nan
+    assert np.all(np.isnan(getBounds(data)))
+
+def test_corner_rejects_small_contour_grid():
+
+    plot_data = {k: {'data': np.zeros(10), 'plot_bounds': (-1, 1), 'label': k} for k in ('x', 'y')}
+    with pytest.raises(ValueError):
+        corner(plot_data, contour_levels=(0.5,), contour_grid_size=1)